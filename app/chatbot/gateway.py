@@ -0,0 +1,312 @@
+import asyncio
+import json
+import random
+import time
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models.chat_models import (
+    BaseChatModel,
+    agenerate_from_stream,
+)
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableBinding
+
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by every LLM call. The refill rate halves on each
+    429 from the provider and creeps back up on successful calls (AIMD).
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        min_rate: float = 0.05,
+        increase: Optional[float] = None,
+    ):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.burst = burst
+        self.increase = increase if increase is not None else rate * 0.05
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _loop_lock(self) -> asyncio.Lock:
+        # A contended asyncio.Lock is bound to its event loop, and the limiter
+        # lives at module level, so give each running loop its own lock
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self):
+        # Waiters queue on the lock so tokens are handed out in arrival order
+        async with self._loop_lock():
+            while True:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limited(self):
+        self._refill()
+        self.rate = max(self.min_rate, self.rate / 2)
+        # Drop the saved-up burst so queued callers back off as well
+        self._tokens = min(self._tokens, 0.0)
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    for candidate in (error, getattr(error, "response", None)):
+        code = getattr(candidate, "status_code", None)
+        if isinstance(code, int):
+            return code
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    if _status_code(error) == 429:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return "ratelimit" in text or "rate limit" in text or "resource_exhausted" in text
+
+
+def is_retryable(error: BaseException) -> bool:
+    if isinstance(error, TimeoutError) or is_rate_limited(error):
+        return True
+    code = _status_code(error)
+    return code is not None and code >= 500
+
+
+class _Flight:
+    """One upstream model call and the chunks it has produced so far."""
+
+    def __init__(self, key: Optional[str]):
+        self.key = key
+        self.chunks: list[ChatGenerationChunk] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[ChatGenerationChunk]:
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                # Each waiter gets its own copy; callers mutate message ids/metadata
+                yield self.chunks[index].model_copy(deep=True)
+                index += 1
+            if self.done:
+                if isinstance(self.error, asyncio.CancelledError):
+                    # Only the caller's own cancellation may surface as one
+                    raise RuntimeError("LLM call was cancelled before it finished")
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class LLMGateway:
+    """
+    Shared entry point for chat model calls across concurrent runs.
+
+    - Rate limits every call through an AdaptiveRateLimiter.
+    - Applies a per-call deadline and retries transient failures with backoff,
+      but only before the first chunk has been streamed.
+    - Coalesces identical in-flight first-turn prompts into a single upstream
+      call; every waiter replays the full stream.
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveRateLimiter,
+        timeout: Optional[float] = 60.0,
+        max_retries: int = 2,
+        backoff: float = 1.0,
+    ):
+        self.limiter = limiter
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._flights: dict[str, _Flight] = {}
+
+    @staticmethod
+    def coalesce_key(messages: list[BaseMessage], **kwargs: Any) -> Optional[str]:
+        """Key for first-turn prompts (system + one human message), else None."""
+        if any(m.type not in ("system", "human") for m in messages):
+            return None
+        if sum(1 for m in messages if m.type == "human") != 1:
+            return None
+        return json.dumps(
+            {"messages": [[m.type, m.content] for m in messages], "kwargs": kwargs},
+            sort_keys=True,
+            default=str,
+        )
+
+    async def _call(
+        self,
+        flight: _Flight,
+        model: BaseChatModel,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]],
+        **kwargs: Any,
+    ):
+        attempt = 0
+        while True:
+            await self.limiter.acquire()
+            try:
+                async with asyncio.timeout(self.timeout):
+                    async for chunk in model._astream(messages, stop=stop, **kwargs):
+                        flight.chunks.append(chunk)
+                        flight.notify()
+                self.limiter.on_success()
+                return
+            except Exception as e:
+                if is_rate_limited(e):
+                    self.limiter.on_rate_limited()
+                if flight.chunks or attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                attempt += 1
+                delay = self.backoff * 2 ** (attempt - 1)
+                print(f"LLM call failed ({e!r}), retry {attempt} in {delay:.1f}s")
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _forget(self, flight: _Flight):
+        if flight.key is not None and self._flights.get(flight.key) is flight:
+            del self._flights[flight.key]
+
+    @staticmethod
+    def _joinable(flight: _Flight) -> bool:
+        task = flight.task
+        return (
+            task is not None
+            and not task.done()
+            and not task.cancelling()
+            and task.get_loop() is asyncio.get_running_loop()
+        )
+
+    async def _run(self, flight: _Flight, *args: Any, **kwargs: Any):
+        try:
+            await self._call(flight, *args, **kwargs)
+        except asyncio.CancelledError as e:
+            flight.error = e
+            raise
+        except Exception as e:
+            flight.error = e
+        finally:
+            flight.done = True
+            self._forget(flight)
+            flight.notify()
+
+    async def astream(
+        self,
+        model: BaseChatModel,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        key = self.coalesce_key(messages, stop=stop, **kwargs)
+        flight = self._flights.get(key) if key is not None else None
+        if flight is not None and not self._joinable(flight):
+            flight = None
+        if flight is None:
+            flight = _Flight(key)
+            if key is not None:
+                self._flights[key] = flight
+            flight.task = asyncio.create_task(
+                self._run(flight, model, messages, stop, **kwargs)
+            )
+
+        flight.subscribers += 1
+        try:
+            async for chunk in flight.subscribe():
+                yield chunk
+        finally:
+            flight.subscribers -= 1
+            # Nobody is listening anymore, so stop paying for the call. Unlist
+            # it first so an identical prompt starts a fresh flight instead.
+            if flight.subscribers == 0 and not flight.done and flight.task:
+                self._forget(flight)
+                flight.task.cancel()
+
+
+class GatewayChatModel(BaseChatModel):
+    """Chat model that routes every async call of `inner` through an LLMGateway."""
+
+    inner: BaseChatModel
+    gateway: LLMGateway
+
+    @property
+    def _llm_type(self) -> str:
+        return f"gateway-{self.inner._llm_type}"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return self.inner._identifying_params
+
+    def bind_tools(self, tools: Any, **kwargs: Any):
+        # Let the provider format the tools, then bind the result to this wrapper
+        bound = self.inner.bind_tools(tools, **kwargs)
+        if not isinstance(bound, RunnableBinding):
+            raise TypeError(
+                f"{type(self.inner).__name__}.bind_tools returned "
+                f"{type(bound).__name__}, expected a RunnableBinding"
+            )
+        return self.bind(**bound.kwargs)
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        # The gateway is asyncio based; sync callers go straight to the provider
+        return self.inner._generate(messages, stop=stop, **kwargs)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        # BaseChatModel reports each chunk to the callbacks of *this* run, so
+        # coalesced waiters all see on_chat_model_stream events
+        async for chunk in self.gateway.astream(self.inner, messages, stop, **kwargs):
+            yield chunk
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: Optional[list[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        return await agenerate_from_stream(
+            self._astream(messages, stop=stop, **kwargs)
+        )
@@ -1,9 +1,11 @@
 from langchain.chat_models import init_chat_model
+from langchain_core.language_models.chat_models import BaseChatModel
 from dotenv import load_dotenv
 from langchain.agents import create_agent
 from memvid_sdk import use
 import os
 from app.chatbot.tools import mcp_client
+from app.chatbot.gateway import AdaptiveRateLimiter, GatewayChatModel, LLMGateway
 
 load_dotenv()
 
@@ -39,12 +41,31 @@ async def get_all_tools():
 
 
 # 2. Initialize LLM
-llm = init_chat_model(
+# Retries and deadlines are owned by the gateway, so the provider client
+# must not retry on its own (that is what turned 429s into retry storms).
+llm_gateway = LLMGateway(
+    limiter=AdaptiveRateLimiter(
+        rate=float(os.getenv("LLM_RATE_LIMIT", "1.0")),
+        burst=int(os.getenv("LLM_BURST", "5")),
+    ),
+    timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+)
+
+chat_model = init_chat_model(
     model=os.getenv("MODEL"),
     temperature=0.1,
     max_tokens=1024,
     timeout=None,
-    max_retries=2,
+    max_retries=0,
+)
+
+# Without MODEL, init_chat_model returns a runtime-configurable placeholder
+# that has no provider behind it yet; only concrete models can be wrapped.
+llm = (
+    GatewayChatModel(inner=chat_model, gateway=llm_gateway)
+    if isinstance(chat_model, BaseChatModel)
+    else chat_model
 )
 
 # 3. System Prompt
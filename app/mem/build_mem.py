@@ -1,4 +1,13 @@
 import fitz  # PyMuPDF
+import json
+import os
+import queue
+import resource
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 from memvid_sdk import use
 from memvid_sdk.entities import get_entity_extractor
@@ -10,57 +19,176 @@ load_dotenv()
 PROVIDER = "local"  # Use Local DistilBERT to keep RPM at 0
 DATASET_DIR = Path("app/mem/")
 OUTPUT_PATH = "app/mem/thai_guide.mv2"
+MAX_IN_FLIGHT_PAGES = 8  # Extracted pages waiting for NER/put
+PROGRESS_EVERY = 50  # Pages between progress lines
 
-# 1. Initialize
-ner = get_entity_extractor(PROVIDER)
-mem = use("langchain", OUTPUT_PATH, mode="auto")
-mem.enable_lex()
-mem.enable_vec()
 
-pdf_files = list(DATASET_DIR.glob("*.pdf"))
+class StageTimer:
+    """Accumulates wall time per pipeline stage."""
 
-for pdf_path in pdf_files:
-    print(f"\nOpening: {pdf_path.name}")
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self._lock = threading.Lock()
 
-    with fitz.open(pdf_path) as doc:
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            page_text = page.get_text("text").strip()  # pyright: ignore[reportAttributeAccessIssue]
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.seconds[name] += elapsed
 
-            if not page_text:
+
+def iter_pages(pdf_files, timer: StageTimer):
+    """Yields (pdf_path, page_number, text) one page at a time."""
+    for pdf_path in pdf_files:
+        print(f"Opening: {pdf_path.name}")
+        # MuPDF reads the file on demand; only the current page is loaded
+        with fitz.open(pdf_path) as doc:
+            for page_num in range(len(doc)):
+                with timer.stage("extract"):
+                    page = doc.load_page(page_num)
+                    page_text = page.get_text("text").strip()  # pyright: ignore[reportAttributeAccessIssue]
+                    del page
+
+                if page_text:
+                    yield pdf_path, page_num + 1, page_text
+
+
+def prefetch(items, maxsize: int):
+    """
+    Runs `items` in a background thread, keeping at most `maxsize` results
+    buffered so extraction overlaps with NER without unbounded memory.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    done = object()
+    stop = threading.Event()
+
+    def offer(item) -> bool:
+        # Give up once the consumer has stopped reading
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
                 continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not offer(item):
+                    return
+        except BaseException as e:
+            offer(e)
+        finally:
+            # Unwind the source (e.g. an open PDF) instead of leaving it suspended
+            close = getattr(items, "close", None)
+            if close:
+                close()
+            offer(done)
 
-            # 2. Extract Entities for THIS PAGE ONLY
-            # This makes the metadata highly specific to the content of this page
+    worker = threading.Thread(target=produce, name="prefetch", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is done:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def extract_entities(pages, ner, timer: StageTimer):
+    """Attaches per-page entity metadata to each extracted page."""
+    for pdf_path, page_number, page_text in pages:
+        # Entities for THIS PAGE ONLY keep the metadata specific to its content
+        with timer.stage("ner"):
             entities = ner.extract(page_text, min_confidence=0.5)
 
-            locations = list(
-                set([e["name"] for e in entities if e["type"] == "LOCATION"])
-            )
-            misc = list(set([e["name"] for e in entities if e["type"] == "MISC"]))
-            persons = list(set([e["name"] for e in entities if e["type"] == "PERSON"]))
-            organizations = list(
-                set([e["name"] for e in entities if e["type"] == "ORG"])
-            )
+        def names(entity_type):
+            return list(set([e["name"] for e in entities if e["type"] == entity_type]))
+
+        yield (
+            pdf_path,
+            page_number,
+            page_text,
+            {
+                "source_file": pdf_path.name,
+                "page_number": page_number,
+                "locations": names("LOCATION"),
+                "persons": names("PERSON"),
+                "misc": names("MISC"),
+                "organizations": names("ORG"),
+            },
+        )
 
-            # 3. Store as an individual frame
-            frame_id = mem.put(
-                title=f"{pdf_path.stem} - Page {page_num + 1}",
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def main():
+    timer = StageTimer()
+    started = time.perf_counter()
+
+    # 1. Initialize
+    ner = get_entity_extractor(PROVIDER)
+    mem = use("langchain", OUTPUT_PATH, mode="auto")
+    mem.enable_lex()
+    mem.enable_vec()
+
+    # 2. Stream pages: extract (background, bounded) -> NER -> put
+    pdf_files = sorted(DATASET_DIR.glob("*.pdf"))
+    pages = prefetch(iter_pages(pdf_files, timer), MAX_IN_FLIGHT_PAGES)
+
+    stored = 0
+    for pdf_path, page_number, page_text, metadata in extract_entities(
+        pages, ner, timer
+    ):
+        # 3. Store as an individual frame
+        with timer.stage("put"):
+            mem.put(
+                title=f"{pdf_path.stem} - Page {page_number}",
                 label="knowledge",
                 text=page_text,
-                metadata={
-                    "source_file": pdf_path.name,
-                    "page_number": page_num + 1,
-                    "locations": locations,
-                    "persons": persons,
-                    "misc": misc,
-                    "organizations": organizations,
-                },
+                metadata=metadata,
             )
 
-            print(
-                f"  Page {page_num + 1} stored (Frame: {frame_id}) | Found: {len(locations)} locs, {len(misc)} misc, {len(persons)} persons, {len(organizations)} orgs"
-            )
+        stored += 1
+        if stored % PROGRESS_EVERY == 0:
+            rate = stored / (time.perf_counter() - started)
+            print(f"  {stored} pages stored ({rate:.1f} pages/sec)")
+
+    with timer.stage("seal"):
+        mem.seal()
+
+    # 4. Throughput report for capacity planning. Extraction runs in the
+    # background, so stage times can add up to more than the total.
+    total = time.perf_counter() - started
+    report = {
+        "pdf_files": len(pdf_files),
+        "pages": stored,
+        "total_seconds": round(total, 2),
+        "pages_per_sec": round(stored / total, 2) if total else 0.0,
+        "stage_seconds": {
+            name: round(timer.seconds[name], 2)
+            for name in ("extract", "ner", "put", "seal")
+        },
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "output_path": OUTPUT_PATH,
+        "output_mb": round(os.path.getsize(OUTPUT_PATH) / (1024 * 1024), 2),
+    }
+    print("\n Mem built successfully.")
+    print(json.dumps(report, indent=2))
+
 
-mem.seal()
-print("\n Mem built successfully.")
+if __name__ == "__main__":
+    main()
@@ -5,8 +5,9 @@ import uvicorn
 import uuid
 import sqlite3
 import asyncio
+import base64
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, Depends, HTTPException, Request
+from fastapi import FastAPI, Depends, HTTPException, Query, Request
 from fastapi.security import APIKeyHeader
 from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -35,16 +36,92 @@ def init_metadata_db():
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        # Keyset pagination walks this index newest-first. Carrying the title
+        # makes it covering, so a page never touches the table itself.
+        conn.execute("DROP INDEX IF EXISTS idx_threads_created")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_threads_listing
+            ON threads (created_at DESC, thread_id DESC, title)
+        """)
         conn.commit()
 
+    init_thread_search()
+
+
+THREADS_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE threads_fts
+    USING fts5(title, content='threads', content_rowid='rowid')
+"""
+
+# Standard external-content triggers: every FTS write is keyed on rowid
+THREADS_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER threads_fts_insert AFTER INSERT ON threads BEGIN
+        INSERT INTO threads_fts (rowid, title) VALUES (new.rowid, new.title);
+    END
+    """,
+    """
+    CREATE TRIGGER threads_fts_delete AFTER DELETE ON threads BEGIN
+        INSERT INTO threads_fts (threads_fts, rowid, title)
+        VALUES ('delete', old.rowid, old.title);
+    END
+    """,
+    """
+    CREATE TRIGGER threads_fts_update AFTER UPDATE OF title ON threads BEGIN
+        INSERT INTO threads_fts (threads_fts, rowid, title)
+        VALUES ('delete', old.rowid, old.title);
+        INSERT INTO threads_fts (rowid, title) VALUES (new.rowid, new.title);
+    END
+    """,
+]
+
+
+def init_thread_search():
+    """
+    Creates the title search index over `threads` and fills it from the
+    existing rows. Index, triggers and backfill commit together, so a crash
+    part-way leaves nothing behind and the next start simply retries.
+
+    The index is keyed on the implicit rowid of `threads`, which VACUUM may
+    renumber; run `INSERT INTO threads_fts(threads_fts) VALUES('rebuild')`
+    after vacuuming the database.
+    """
+    conn = sqlite3.connect(DB_PATH, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'threads_fts'"
+        ).fetchone()
+        if row and "content='threads'" in row[0]:
+            conn.execute("COMMIT")
+            return
+
+        # Missing, or the older standalone layout: recreate from scratch
+        for trigger in ("threads_fts_insert", "threads_fts_delete", "threads_fts_update"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        conn.execute("DROP TABLE IF EXISTS threads_fts")
+        conn.execute(THREADS_FTS_SCHEMA)
+        for trigger in THREADS_FTS_TRIGGERS:
+            conn.execute(trigger)
+        conn.execute("INSERT INTO threads_fts (threads_fts) VALUES ('rebuild')")
+        conn.execute("COMMIT")
+    except Exception:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+
 
-def save_thread_metadata(thread_id: str, title: str):
+def save_thread_metadata(thread_id: str, title: str) -> bool:
+    """Records a thread if it is new. Returns True when a row was inserted."""
     with sqlite3.connect(DB_PATH) as conn:
-        conn.execute(
+        cursor = conn.execute(
             "INSERT OR IGNORE INTO threads (thread_id, title) VALUES (?, ?)",
             (thread_id, title),
         )
         conn.commit()
+        return cursor.rowcount == 1
 
 
 def update_thread_title(thread_id: str, title: str):
@@ -55,13 +132,86 @@ def update_thread_title(thread_id: str, title: str):
         conn.commit()
 
 
-def get_all_threads():
+def encode_cursor(*keys) -> str:
+    raw = json.dumps(list(keys)).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        keys = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(keys, list) or len(keys) != size:
+        raise ValueError("Invalid cursor")
+    return keys
+
+
+def build_fts_query(search: str) -> str:
+    # Quote every term so user input can't inject FTS5 syntax; prefix-match each
+    terms = search.split()
+    return " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+
+
+def get_threads_page(limit: int, cursor: str | None = None, search: str | None = None):
+    """
+    Returns (threads, next_cursor), newest first. `next_cursor` is None on
+    the last page.
+
+    Listing pages by keyset on (created_at, thread_id) through the covering
+    idx_threads_listing. Search pages by keyset on the FTS rowid, which
+    FTS5 walks in descending order itself, so neither path sorts more than
+    one page. Search results follow insertion order; the two cursor kinds
+    are not interchangeable.
+    """
+    if search and search.strip():
+        params: list = [build_fts_query(search)]
+        after = ""
+        if cursor:
+            (rowid,) = decode_cursor(cursor, 1)
+            if not isinstance(rowid, int):
+                raise ValueError("Invalid cursor")
+            after = "AND rowid < ?"
+            params.append(rowid)
+        query = f"""
+            SELECT t.thread_id, t.title, t.created_at, m.rowid AS fts_rowid
+            FROM (
+                SELECT rowid FROM threads_fts
+                WHERE threads_fts MATCH ? {after}
+                ORDER BY rowid DESC LIMIT ?
+            ) m
+            JOIN threads t ON t.rowid = m.rowid
+            ORDER BY m.rowid DESC
+        """
+    else:
+        params = []
+        after = ""
+        if cursor:
+            created_at, thread_id = decode_cursor(cursor, 2)
+            after = "WHERE (created_at, thread_id) < (?, ?)"
+            params.extend([str(created_at), str(thread_id)])
+        query = f"""
+            SELECT thread_id, title, created_at FROM threads {after}
+            ORDER BY created_at DESC, thread_id DESC LIMIT ?
+        """
+    # Fetch one extra row to know whether another page exists
+    params.append(limit + 1)
+
     with sqlite3.connect(DB_PATH) as conn:
         conn.row_factory = sqlite3.Row
-        cursor = conn.execute(
-            "SELECT thread_id, title, created_at FROM threads ORDER BY created_at DESC"
-        )
-        return [dict(row) for row in cursor.fetchall()]
+        rows = [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        if "fts_rowid" in last:
+            next_cursor = encode_cursor(last["fts_rowid"])
+        else:
+            next_cursor = encode_cursor(last["created_at"], last["thread_id"])
+    for row in rows:
+        row.pop("fts_rowid", None)
+    return rows, next_cursor
 
 
 def delete_thread_metadata(thread_id: str):
@@ -94,6 +244,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Thread-Created"],
 )
 
 API_KEY_NAME = "X-API-Key"
@@ -118,12 +269,23 @@ class ThreadUpdate(BaseModel):
 
 
 @app.get("/threads", dependencies=[Depends(verify_api_key)])
-async def list_threads():
-    """List all available chat sessions."""
+async def list_threads(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str | None = None,
+    q: str | None = None,
+):
+    """List chat sessions newest first, one page at a time, optionally filtered by title."""
     try:
-        threads = get_all_threads()
-        # Map to frontend format
-        return [
+        threads, next_cursor = get_threads_page(limit, cursor, q)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        print(f"Error listing threads: {e}")
+        return {"threads": [], "nextCursor": None}
+
+    # Map to frontend format
+    return {
+        "threads": [
             {
                 "id": t["thread_id"],
                 "title": t["title"] or "Untitled Chat",
@@ -132,10 +294,9 @@ async def list_threads():
                 ],  # You might want to format this or send raw
             }
             for t in threads
-        ]
-    except Exception as e:
-        print(f"Error listing threads: {e}")
-        return []
+        ],
+        "nextCursor": next_cursor,
+    }
 
 
 @app.patch("/threads/{thread_id}", dependencies=[Depends(verify_api_key)])
@@ -224,7 +385,7 @@ async def stream_agent(request: Request):
     if not thread_id:
         thread_id = str(uuid.uuid4())
 
-    save_thread_metadata(thread_id, "New Chat")
+    created = save_thread_metadata(thread_id, "New Chat")
 
     # Queue for streaming tokens between the background task and the HTTP response
     queue = asyncio.Queue()
@@ -296,7 +457,12 @@ async def stream_agent(request: Request):
             )
             raise
 
-    return StreamingResponse(response_generator(), media_type="text/event-stream")
+    # Lets the client title a brand-new thread without guessing from its list
+    return StreamingResponse(
+        response_generator(),
+        media_type="text/event-stream",
+        headers={"X-Thread-Created": "true" if created else "false"},
+    )
 
 
 @app.get("/health")
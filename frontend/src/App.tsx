@@ -44,19 +44,50 @@ function App() {
 
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
-  const fetchSessions = async () => {
+  const [sessionSearch, setSessionSearch] = useState('');
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  // Drops responses from superseded requests (e.g. while typing a search)
+  const sessionsRequestRef = useRef(0);
+  // Pages appended via "Load more" since the list was last reset
+  const loadedPagesRef = useRef(0);
+
+  // Loads the page after `cursor`, or page 1. Page 1 either replaces the list
+  // (`reset`, e.g. a new search) or is merged into it so a refresh keeps the
+  // pages the user already loaded.
+  const fetchSessions = async (cursor?: string, reset = false) => {
     if (!apiKey) return;
+    const requestId = ++sessionsRequestRef.current;
+    const params = new URLSearchParams();
+    if (cursor) params.set('cursor', cursor);
+    if (sessionSearch.trim()) params.set('q', sessionSearch.trim());
     try {
-      const res = await fetch('http://localhost:2024/threads', {
+      const res = await fetch(`http://localhost:2024/threads?${params}`, {
         headers: { 'X-API-Key': apiKey }
       });
       if (res.status === 403) {
         setShowSettings(true);
         return;
       }
-      if (res.ok) {
+      if (res.ok && requestId === sessionsRequestRef.current) {
         const data = await res.json();
-        setSessions(data);
+        const page: ChatSession[] = data.threads;
+        const pageIds = new Set(page.map(s => s.id));
+
+        if (cursor) {
+          loadedPagesRef.current += 1;
+          setSessions(prev => {
+            const loadedIds = new Set(prev.map(s => s.id));
+            return [...prev, ...page.filter(s => !loadedIds.has(s.id))];
+          });
+          setNextCursor(data.nextCursor);
+        } else if (reset || loadedPagesRef.current === 0) {
+          loadedPagesRef.current = 0;
+          setSessions(page);
+          setNextCursor(data.nextCursor);
+        } else {
+          // Keep later pages and their cursor; only page 1 is refreshed
+          setSessions(prev => [...page, ...prev.filter(s => !pageIds.has(s.id))]);
+        }
       }
     } catch (e) {
       console.error("Failed to fetch sessions", e);
@@ -105,8 +136,9 @@ function App() {
 
 
   useEffect(() => {
-    fetchSessions();
-  }, [apiKey]);
+    const timer = setTimeout(() => fetchSessions(undefined, true), 250);
+    return () => clearTimeout(timer);
+  }, [apiKey, sessionSearch]);
 
   useEffect(() => {
     localStorage.setItem('travai_current_session_id', currentSessionId);
@@ -318,8 +350,6 @@ function App() {
       return;
     }
 
-    const isNewSession = !sessions.find(s => s.id === currentSessionId);
-
     const userMessage: Message = { role: 'user', content: textToSend };
     setMessages(prev => [...prev, userMessage]);
     setInput(''); // Clear input regardless
@@ -363,7 +393,9 @@ function App() {
       if (!response.ok) throw new Error(`HTTP error! status: ${response.status}`);
       if (!response.body) throw new Error("No response body");
 
-      if (isNewSession) {
+      // The server reports whether this message created the thread; the loaded
+      // session list is paged and filtered, so it can't tell us
+      if (response.headers.get('X-Thread-Created') === 'true') {
         const title = textToSend.slice(0, 30) + (textToSend.length > 30 ? '...' : '');
         await updateThreadTitle(currentSessionId, title);
         fetchSessions();
@@ -464,6 +496,10 @@ function App() {
         onSelectSession={setCurrentSessionId}
         onDeleteSession={handleDeleteSession}
         onOpenSettings={() => setShowSettings(!showSettings)}
+        searchQuery={sessionSearch}
+        onSearchChange={setSessionSearch}
+        hasMoreSessions={nextCursor !== null}
+        onLoadMoreSessions={() => nextCursor && fetchSessions(nextCursor)}
       />
 
       {/* Main Content Area (Chat + PDF) */}
@@ -1,5 +1,5 @@
 import React from 'react';
-import { Plus, MessageSquare, Trash2, Settings, X, Map } from 'lucide-react';
+import { Plus, MessageSquare, Trash2, Settings, X, Map, Search } from 'lucide-react';
 import { type ChatSession } from '../types';
 
 interface SidebarProps {
@@ -11,6 +11,10 @@ interface SidebarProps {
   onSelectSession: (id: string) => void;
   onDeleteSession: (e: React.MouseEvent, id: string) => void;
   onOpenSettings: () => void;
+  searchQuery: string;
+  onSearchChange: (query: string) => void;
+  hasMoreSessions: boolean;
+  onLoadMoreSessions: () => void;
 }
 
 const Sidebar: React.FC<SidebarProps> = ({
@@ -22,6 +26,10 @@ const Sidebar: React.FC<SidebarProps> = ({
   onSelectSession,
   onDeleteSession,
   onOpenSettings,
+  searchQuery,
+  onSearchChange,
+  hasMoreSessions,
+  onLoadMoreSessions,
 }) => {
   return (
     <div className={`
@@ -52,6 +60,20 @@ const Sidebar: React.FC<SidebarProps> = ({
         </button>
       </div>
 
+      {/* Session Search */}
+      <div className="px-4 pb-4">
+        <div className="flex items-center gap-2 px-3 py-2 rounded-lg bg-slate-800/60 text-slate-400 focus-within:text-slate-200">
+          <Search size={14} />
+          <input
+            type="text"
+            value={searchQuery}
+            onChange={(e) => onSearchChange(e.target.value)}
+            placeholder="Search trips"
+            className="w-full bg-transparent text-sm text-slate-200 placeholder-slate-500 outline-none"
+          />
+        </div>
+      </div>
+
       {/* Session List */}
       <div className="flex-1 overflow-y-auto px-3 space-y-1 custom-scrollbar">
         <div className="text-xs font-bold text-slate-500 px-3 py-2 uppercase tracking-widest mb-1">Your Trips</div>
@@ -80,6 +102,14 @@ const Sidebar: React.FC<SidebarProps> = ({
             </button>
           </div>
         ))}
+        {hasMoreSessions && (
+          <button
+            onClick={onLoadMoreSessions}
+            className="w-full px-3 py-2 text-xs font-bold text-slate-500 hover:text-slate-200 uppercase tracking-widest transition-colors"
+          >
+            Load more
+          </button>
+        )}
       </div>
 
       {/* Settings Area */}
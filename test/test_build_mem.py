@@ -0,0 +1,105 @@
+import os
+import sys
+import threading
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.mem import build_mem
+from app.mem.build_mem import StageTimer, prefetch
+
+
+def test_prefetch_keeps_order_and_stays_bounded():
+    produced = []
+
+    def source():
+        for i in range(20):
+            produced.append(i)
+            yield i
+
+    pages = prefetch(source(), maxsize=2)
+    assert next(pages) == 0
+    time.sleep(0.2)
+    # One item handed out, two buffered, one held by the blocked producer
+    assert len(produced) <= 4
+
+    assert [0] + list(pages) == list(range(20))
+
+
+def test_prefetch_reraises_producer_errors():
+    def source():
+        yield 1
+        raise RuntimeError("corrupt page")
+
+    pages = prefetch(source(), maxsize=2)
+    assert next(pages) == 1
+    try:
+        next(pages)
+    except RuntimeError as e:
+        assert str(e) == "corrupt page"
+    else:
+        raise AssertionError("the producer's error should reach the consumer")
+
+
+def test_closing_prefetch_stops_worker_and_closes_source():
+    source_closed = threading.Event()
+
+    def source():
+        try:
+            for i in range(1000):
+                yield i
+        finally:
+            source_closed.set()
+
+    pages = prefetch(source(), maxsize=2)
+    next(pages)
+    pages.close()
+
+    assert source_closed.wait(timeout=2)
+    workers = [t for t in threading.enumerate() if t.name == "prefetch"]
+    for worker in workers:
+        worker.join(timeout=2)
+    assert not any(worker.is_alive() for worker in workers)
+
+
+def test_stage_timer_accumulates_per_stage():
+    timer = StageTimer()
+    for _ in range(2):
+        with timer.stage("ner"):
+            time.sleep(0.01)
+    try:
+        with timer.stage("put"):
+            raise ValueError
+    except ValueError:
+        pass
+
+    assert timer.seconds["ner"] >= 0.02
+    assert "put" in timer.seconds
+    assert timer.seconds["extract"] == 0
+
+
+def test_peak_rss_is_reported_in_megabytes_on_each_platform():
+    class Usage:
+        ru_maxrss = 200 * 1024 * 1024  # bytes, as macOS reports it
+
+    original = (build_mem.sys.platform, build_mem.resource.getrusage)
+    try:
+        build_mem.resource.getrusage = lambda who: Usage
+        build_mem.sys.platform = "darwin"
+        assert build_mem.peak_rss_mb() == 200
+
+        Usage.ru_maxrss = 200 * 1024  # kilobytes, as Linux reports it
+        build_mem.sys.platform = "linux"
+        assert build_mem.peak_rss_mb() == 200
+    finally:
+        build_mem.sys.platform, build_mem.resource.getrusage = original
+
+
+if __name__ == "__main__":
+    test_prefetch_keeps_order_and_stays_bounded()
+    test_prefetch_reraises_producer_errors()
+    test_closing_prefetch_stops_worker_and_closes_source()
+    test_stage_timer_accumulates_per_stage()
+    test_peak_rss_is_reported_in_megabytes_on_each_platform()
+    print("Ingestion pipeline tests passed.")
@@ -0,0 +1,131 @@
+import asyncio
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessageChunk, HumanMessage, SystemMessage
+from langchain_core.outputs import ChatGenerationChunk
+
+from app.chatbot.gateway import AdaptiveRateLimiter, GatewayChatModel, LLMGateway
+
+
+class CountingModel(BaseChatModel):
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "counting"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        raise NotImplementedError
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        self.calls += 1
+        for word in ["Visit ", "Wat ", "Arun"]:
+            await asyncio.sleep(0.01)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+
+def make_llm():
+    inner = CountingModel()
+    gateway = LLMGateway(AdaptiveRateLimiter(rate=100, burst=100), timeout=5)
+    return inner, GatewayChatModel(inner=inner, gateway=gateway)
+
+
+def test_coalesces_identical_first_turn_prompts():
+    inner, llm = make_llm()
+    prompt = [SystemMessage("guide"), HumanMessage("Where to go in Bangkok?")]
+
+    async def run():
+        return await asyncio.gather(*(llm.ainvoke(prompt) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert inner.calls == 1
+    assert all(r.content == "Visit Wat Arun" for r in results)
+
+
+def test_does_not_coalesce_follow_up_turns():
+    inner, llm = make_llm()
+    history = [
+        SystemMessage("guide"),
+        HumanMessage("Hi"),
+        AIMessageChunk(content="Hello"),
+        HumanMessage("Where to go in Bangkok?"),
+    ]
+
+    async def run():
+        return await asyncio.gather(*(llm.ainvoke(history) for _ in range(3)))
+
+    asyncio.run(run())
+    assert inner.calls == 3
+
+
+def test_rate_limiter_backs_off_on_429():
+    limiter = AdaptiveRateLimiter(rate=4, burst=4)
+    limiter.on_rate_limited()
+    assert limiter.rate == 2
+    limiter.on_success()
+    assert 2 < limiter.rate <= 4
+
+
+def test_bind_tools_rejects_unbound_result():
+    class NoBindingModel(CountingModel):
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+    llm = GatewayChatModel(
+        inner=NoBindingModel(),
+        gateway=LLMGateway(AdaptiveRateLimiter(rate=1, burst=1)),
+    )
+    try:
+        llm.bind_tools([])
+    except TypeError:
+        return
+    raise AssertionError("bind_tools should refuse to drop the tools silently")
+
+
+def test_late_joiner_after_cancel_starts_a_fresh_call():
+    inner, llm = make_llm()
+    gateway = llm.gateway
+    prompt = [SystemMessage("guide"), HumanMessage("Where to go in Bangkok?")]
+
+    async def run():
+        first = gateway.astream(inner, prompt)
+        await first.__anext__()
+        # The only subscriber leaves, cancelling its upstream call
+        await first.aclose()
+
+        chunks = [chunk async for chunk in gateway.astream(inner, prompt)]
+        return "".join(chunk.text for chunk in chunks)
+
+    assert asyncio.run(run()) == "Visit Wat Arun"
+    assert inner.calls == 2
+
+
+def test_limiter_works_across_event_loops():
+    inner, llm = make_llm()
+    llm.gateway.limiter = AdaptiveRateLimiter(rate=50, burst=1)
+    prompt = [SystemMessage("guide"), HumanMessage("Hi")]
+
+    async def run(n):
+        # Distinct prompts so every call contends for the limiter lock
+        return await asyncio.gather(
+            *(llm.ainvoke(prompt + [HumanMessage(str(i))]) for i in range(n))
+        )
+
+    asyncio.run(run(3))
+    asyncio.run(run(3))
+    assert inner.calls == 6
+
+
+if __name__ == "__main__":
+    test_coalesces_identical_first_turn_prompts()
+    test_does_not_coalesce_follow_up_turns()
+    test_rate_limiter_backs_off_on_429()
+    test_bind_tools_rejects_unbound_result()
+    test_late_joiner_after_cancel_starts_a_fresh_call()
+    test_limiter_works_across_event_loops()
+    print("Gateway tests passed.")
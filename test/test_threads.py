@@ -0,0 +1,161 @@
+import os
+import sqlite3
+import sys
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient
+from app import server
+from app.server import app, API_KEY
+
+client = TestClient(app)
+
+
+def fresh_db():
+    """Points the server at an empty metadata database."""
+    server.DB_PATH = os.path.join(tempfile.mkdtemp(), "threads.sqlite")
+    server.init_metadata_db()
+
+
+def insert_thread(thread_id, title, created_at):
+    with sqlite3.connect(server.DB_PATH) as conn:
+        conn.execute(
+            "INSERT INTO threads (thread_id, title, created_at) VALUES (?, ?, ?)",
+            (thread_id, title, created_at),
+        )
+
+
+def search_ids(q):
+    threads, _ = server.get_threads_page(50, search=q)
+    return sorted(t["thread_id"] for t in threads)
+
+
+def test_pages_cover_every_thread_once_with_timestamp_ties():
+    fresh_db()
+    # created_at has second resolution, so many threads share a timestamp
+    expected = []
+    for second in range(4):
+        for n in range(5):
+            thread_id = f"t{second}-{n}"
+            insert_thread(thread_id, "New Chat", f"2026-01-01 00:00:0{second}")
+            expected.append((f"2026-01-01 00:00:0{second}", thread_id))
+    expected.sort(reverse=True)
+
+    seen = []
+    cursor = None
+    while True:
+        threads, cursor = server.get_threads_page(3, cursor)
+        assert len(threads) <= 3
+        seen.extend((t["created_at"], t["thread_id"]) for t in threads)
+        if cursor is None:
+            break
+
+    assert seen == expected
+
+
+def test_bad_cursor_is_rejected():
+    fresh_db()
+    try:
+        server.get_threads_page(10, "not-a-cursor")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a malformed cursor should raise ValueError")
+
+    response = client.get(
+        "/threads", params={"cursor": "not-a-cursor"}, headers={"X-API-Key": API_KEY}
+    )
+    assert response.status_code == 400
+
+
+def test_save_reports_only_new_threads():
+    fresh_db()
+    assert server.save_thread_metadata("a", "New Chat") is True
+    assert server.save_thread_metadata("a", "New Chat") is False
+
+
+def test_search_index_follows_insert_rename_and_delete():
+    fresh_db()
+    server.save_thread_metadata("a", "Bangkok street food")
+    server.save_thread_metadata("b", "Phuket beaches")
+    assert search_ids("bang") == ["a"]
+
+    server.update_thread_title("a", "Chiang Mai temples")
+    assert search_ids("bangkok") == []
+    assert search_ids("chiang") == ["a"]
+
+    server.delete_thread_metadata("b")
+    assert search_ids("phuket") == []
+
+    with sqlite3.connect(server.DB_PATH) as conn:
+        conn.execute("INSERT INTO threads_fts (threads_fts) VALUES ('integrity-check')")
+
+
+def test_existing_threads_are_backfilled():
+    fresh_db()
+    insert_thread("old", "Krabi islands", "2025-06-01 10:00:00")
+    with sqlite3.connect(server.DB_PATH) as conn:
+        conn.execute("DROP TABLE threads_fts")
+
+    server.init_thread_search()
+    assert search_ids("krabi") == ["old"]
+
+
+def test_fts_syntax_in_query_is_treated_as_text():
+    fresh_db()
+    server.save_thread_metadata("a", "Bangkok trip")
+    server.save_thread_metadata("b", "Phuket trip")
+
+    for q in ['"', "AND", "*", "bangkok AND", "NEAR(", "title:x", "a OR"]:
+        threads, _ = server.get_threads_page(50, search=q)
+        assert all(t["thread_id"] in ("a", "b") for t in threads), q
+
+    # Quoted, "OR" is just another term that neither title contains
+    assert search_ids("bangkok OR phuket") == []
+    assert search_ids("bangkok trip") == ["a"]
+
+
+def test_search_pages_cover_every_match_once():
+    fresh_db()
+    for n in range(10):
+        server.save_thread_metadata(f"trip{n}", f"Bangkok trip {n}")
+    server.save_thread_metadata("other", "Phuket beaches")
+
+    seen = []
+    cursor = None
+    while True:
+        threads, cursor = server.get_threads_page(3, cursor, search="trip")
+        seen.extend(t["thread_id"] for t in threads)
+        if cursor is None:
+            break
+
+    assert seen == [f"trip{n}" for n in reversed(range(10))]
+
+
+def test_listing_and_search_cursors_are_not_interchangeable():
+    fresh_db()
+    for n in range(3):
+        server.save_thread_metadata(f"t{n}", "Bangkok trip")
+
+    _, list_cursor = server.get_threads_page(1)
+    _, search_cursor = server.get_threads_page(1, search="bangkok")
+    for cursor, search in ((list_cursor, "bangkok"), (search_cursor, None)):
+        try:
+            server.get_threads_page(1, cursor, search=search)
+        except ValueError:
+            continue
+        raise AssertionError("a cursor from the other mode should be rejected")
+
+
+if __name__ == "__main__":
+    test_pages_cover_every_thread_once_with_timestamp_ties()
+    test_bad_cursor_is_rejected()
+    test_save_reports_only_new_threads()
+    test_search_index_follows_insert_rename_and_delete()
+    test_existing_threads_are_backfilled()
+    test_fts_syntax_in_query_is_treated_as_text()
+    test_search_pages_cover_every_match_once()
+    test_listing_and_search_cursors_are_not_interchangeable()
+    print("Thread listing tests passed.")